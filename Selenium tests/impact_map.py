@@ -0,0 +1,306 @@
+"""Coverage-driven test-impact selection for the Selenium suites.
+
+Recording (``python impact_map.py record``) runs every Selenium test with
+IMPACT_RECORD=1. Each test collects browser JS coverage through the Chrome
+DevTools Protocol, plus the backend route files that served its requests
+(the backend must run with RECORD_ROUTE_HITS=true). The results are stored
+in impact_map.json, linking each test to the src/ and backend/routes files
+it exercised.
+
+Selection (``python impact_map.py select`` / ``run``) maps a git diff onto
+that file and runs only the affected tests. It falls back to the full suite
+when the map is stale or a change touches code the map does not cover.
+"""
+import argparse
+import ast
+import inspect
+import json
+import os
+import subprocess
+import sys
+import unittest
+import urllib.error
+import urllib.request
+from pathlib import Path
+from urllib.parse import urlparse
+
+TESTS_DIR = Path(__file__).resolve().parent
+REPO_ROOT = TESTS_DIR.parent
+MAP_FILE = TESTS_DIR / "impact_map.json"
+FRAGMENTS_DIR = TESTS_DIR / ".impact"
+
+TEST_MODULES = [
+    "test_selenium_authentication",
+    "test_selenium_product_browsing",
+    "test_selenium_checkout",
+]
+
+# Files the map links tests to; anything else that changes forces a full run
+MAPPED_ROOTS = ("src/", "backend/routes/")
+# Changes here can't affect the Selenium suites
+IGNORED_ROOTS = (".github/", "Simple Docker Application/", "Selenium tests/impact_map.json")
+IGNORED_SUFFIXES = (".md", ".png", ".gif")
+
+API_URL = os.environ.get("IMPACT_API_URL", "http://localhost:5000")
+
+
+# ---------------------------------------------------------------------------
+# Recording hooks, called from each test's setUp/tearDown
+# ---------------------------------------------------------------------------
+
+def start_recording(test):
+    """Start JS coverage and reset backend route hits for a test.
+
+    Failures are reported and leave the test unrecorded rather than failing
+    setUp, which would skip tearDown and leak the browser.
+    """
+    test.impact_recording = False
+    if os.environ.get("IMPACT_RECORD") != "1":
+        return
+    try:
+        test.driver.execute_cdp_cmd("Profiler.enable", {})
+        test.driver.execute_cdp_cmd(
+            "Profiler.startPreciseCoverage", {"callCount": True, "detailed": False}
+        )
+        _route_hits("DELETE")
+    except urllib.error.HTTPError as e:
+        print(f"⚠️ Impact recording skipped for {_test_id(test)}: route-hits endpoint "
+              f"returned {e.code}, start the backend with RECORD_ROUTE_HITS=true")
+        return
+    except Exception as e:
+        print(f"⚠️ Impact recording skipped for {_test_id(test)}: {str(e)}")
+        return
+    test.impact_recording = True
+
+
+def stop_recording(test):
+    """Write the src/ and backend/routes files a test exercised"""
+    if not getattr(test, "impact_recording", False):
+        return
+    try:
+        coverage = test.driver.execute_cdp_cmd("Profiler.takePreciseCoverage", {})
+        test.driver.execute_cdp_cmd("Profiler.stopPreciseCoverage", {})
+        files = sorted(set(_covered_sources(coverage["result"])) | set(_route_hits("GET")))
+    except Exception as e:
+        # Unrecorded tests have no map entry and are always selected
+        print(f"⚠️ Impact recording failed for {_test_id(test)}: {str(e)}")
+        return
+
+    FRAGMENTS_DIR.mkdir(exist_ok=True)
+    fragment = FRAGMENTS_DIR / f"{_test_id(test)}.json"
+    fragment.write_text(json.dumps(files, indent=2))
+
+
+def _test_id(test):
+    """unittest id that stays stable whether the file is run directly or via -m unittest"""
+    module = Path(inspect.getfile(type(test))).stem
+    return f"{module}.{type(test).__name__}.{test._testMethodName}"
+
+
+def _covered_sources(scripts):
+    """Repo paths of the src/ modules whose code actually ran.
+
+    App.jsx imports every page eagerly, so loading a module says nothing.
+    A module only counts when one of its named functions (components, hooks,
+    handlers) was called. The Fast Refresh wrapper that @vitejs/plugin-react
+    adds in dev also runs on load: an assignment to window.$RefreshReg$ plus
+    anonymous callbacks, so those are ignored. Modules without named
+    functions (constants, CSS) count as soon as they are loaded.
+    """
+    for script in scripts:
+        path = urlparse(script["url"]).path.lstrip("/")
+        if not path.startswith("src/") or not (REPO_ROOT / path).is_file():
+            continue
+        named = [
+            fn for fn in script["functions"]
+            if fn["functionName"] and "$Refresh" not in fn["functionName"]
+        ]
+        if not named or any(fn["ranges"][0]["count"] > 0 for fn in named):
+            yield path
+
+
+def _route_hits(method):
+    request = urllib.request.Request(f"{API_URL}/api/__impact/route-hits", method=method)
+    with urllib.request.urlopen(request, timeout=10) as response:
+        return json.load(response)["data"]["files"]
+
+
+# ---------------------------------------------------------------------------
+# Map building and test selection
+# ---------------------------------------------------------------------------
+
+def _git(*args):
+    result = subprocess.run(
+        ["git", *args], cwd=REPO_ROOT, capture_output=True, text=True
+    )
+    if result.returncode != 0:
+        raise RuntimeError(result.stderr.strip() or f"git {' '.join(args)} failed")
+    return result.stdout
+
+
+def all_tests():
+    """Every Selenium test id, found without importing selenium"""
+    tests = []
+    for module in TEST_MODULES:
+        tree = ast.parse((TESTS_DIR / f"{module}.py").read_text())
+        for node in tree.body:
+            if isinstance(node, ast.ClassDef):
+                tests.extend(
+                    f"{module}.{node.name}.{item.name}"
+                    for item in node.body
+                    if isinstance(item, ast.FunctionDef) and item.name.startswith("test_")
+                )
+    return tests
+
+
+def record():
+    """Run the full suite with recording on and rebuild impact_map.json.
+
+    Tests that fail, error or skip only reached part of the code they cover,
+    so their fragments are dropped; unrecorded tests are always selected.
+    """
+    for fragment in FRAGMENTS_DIR.glob("*.json"):
+        fragment.unlink()
+
+    os.environ["IMPACT_RECORD"] = "1"
+    sys.path.insert(0, str(TESTS_DIR))
+    suite = unittest.defaultTestLoader.loadTestsFromNames(TEST_MODULES)
+    result = unittest.TextTestRunner(verbosity=2).run(suite)
+
+    for test, _ in result.failures + result.errors + result.skipped:
+        if isinstance(test, unittest.TestCase):
+            (FRAGMENTS_DIR / f"{_test_id(test)}.json").unlink(missing_ok=True)
+
+    tests = {
+        fragment.stem: json.loads(fragment.read_text())
+        for fragment in sorted(FRAGMENTS_DIR.glob("*.json"))
+    }
+    if not _covers_src(tests):
+        print("❌ No recorded test covered any src/ file, impact map not written. "
+              "Record against the Vite dev server (npm run dev), not a production build.")
+        return 1
+    impact = {
+        "commit": _git("rev-parse", "HEAD").strip(),
+        "files": _git("ls-files", "--", *MAPPED_ROOTS).splitlines(),
+        "tests": tests,
+    }
+    MAP_FILE.write_text(json.dumps(impact, indent=2) + "\n")
+    print(f"📝 Recorded {len(tests)} tests into {MAP_FILE.name}")
+    return 0 if result.wasSuccessful() else 1
+
+
+def _covers_src(tests):
+    """Whether any test links to a src/ file.
+
+    A map recorded against a production build only sees hashed bundles, so
+    every src/ change would select no tests at all.
+    """
+    return any(path.startswith("src/") for files in tests.values() for path in files)
+
+
+def load_map():
+    """Return the impact map, or None with a reason when it can't be trusted"""
+    if not MAP_FILE.is_file():
+        return None, "no impact map recorded"
+    try:
+        impact = json.loads(MAP_FILE.read_text())
+        commit = impact["commit"]
+        tests = impact["tests"]
+    except (ValueError, KeyError):
+        return None, "impact map is unreadable"
+    if not _covers_src(tests):
+        return None, "no test in the impact map covers a src/ file"
+
+    try:
+        _git("merge-base", "--is-ancestor", commit, "HEAD")
+    except RuntimeError:
+        return None, f"map commit {commit[:8]} is not an ancestor of HEAD"
+    return impact, None
+
+
+def drifted_files(commit):
+    """Mapped files and tests changed since the map was recorded.
+
+    Their recorded links may no longer hold (e.g. Home now renders a new
+    component), so they are treated as changed too.
+    """
+    test_files = [f"Selenium tests/{module}.py" for module in TEST_MODULES]
+    return _git("diff", "--name-only", commit, "HEAD", "--", *MAPPED_ROOTS, *test_files).splitlines()
+
+
+def changed_files(base):
+    """Files this branch changed since it forked from ``base``.
+
+    Diffing against the merge-base keeps upstream changes the branch doesn't
+    have out of the selection. Uncommitted and untracked files are included.
+    """
+    fork_point = _git("merge-base", base, "HEAD").strip()
+    changed = _git("diff", "--name-only", fork_point).splitlines()
+    changed += _git("ls-files", "--others", "--exclude-standard").splitlines()
+    return sorted(set(path for path in changed if path))
+
+
+def select(base):
+    """Return (tests to run, reason) for the changes against ``base``"""
+    tests = all_tests()
+    impact, stale = load_map()
+    if stale:
+        return tests, f"{stale}, running full suite"
+
+    mapped = set(impact["files"])
+    selected = {test for test in tests if test not in impact["tests"]}
+    try:
+        changed = set(changed_files(base)) | set(drifted_files(impact["commit"]))
+    except RuntimeError as e:
+        # e.g. an unknown --base, or a shallow clone without the merge-base
+        return tests, f"{e}, running full suite"
+    for path in sorted(path for path in changed if path):
+        if path.startswith(IGNORED_ROOTS) or path.endswith(IGNORED_SUFFIXES):
+            continue
+        module = Path(path).stem
+        if path.startswith("Selenium tests/") and module in TEST_MODULES:
+            selected.update(test for test in tests if test.startswith(f"{module}."))
+        elif path.startswith(MAPPED_ROOTS) and path in mapped:
+            selected.update(
+                test for test, files in impact["tests"].items() if path in files
+            )
+        else:
+            return tests, f"{path} is not covered by the impact map, running full suite"
+
+    return [test for test in tests if test in selected], None
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    commands = parser.add_subparsers(dest="command", required=True)
+    commands.add_parser("record", help="run all tests and rebuild the impact map")
+    for name, help_text in (
+        ("select", "print the tests affected by a git diff"),
+        ("run", "run the tests affected by a git diff"),
+    ):
+        command = commands.add_parser(name, help=help_text)
+        command.add_argument(
+            "--base", default="HEAD",
+            help="git ref whose merge-base with HEAD the working tree is diffed against (default: HEAD)",
+        )
+    args = parser.parse_args()
+
+    if args.command == "record":
+        return record()
+
+    tests, reason = select(args.base)
+    if reason:
+        print(f"⚠️ {reason}", file=sys.stderr)
+    if args.command == "select":
+        print("\n".join(tests))
+        return 0
+    if not tests:
+        print("✅ No Selenium tests affected by this change")
+        return 0
+    return subprocess.run(
+        [sys.executable, "-m", "unittest", "-v", *tests], cwd=TESTS_DIR
+    ).returncode
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -9,6 +9,7 @@ from selenium.webdriver.chrome.service import Service
 from selenium.webdriver.chrome.options import Options
 import random
 import string
+import impact_map
 
 class TestAuthenticationFlow(unittest.TestCase):
     
@@ -30,9 +31,13 @@ class TestAuthenticationFlow(unittest.TestCase):
         # Base URL - update this to match your application URL
         self.base_url = "http://localhost:5173"  # Default Vite dev server port
         
+        # Start JS coverage and route-hit recording (no-op unless IMPACT_RECORD=1)
+        impact_map.start_recording(self)
+        
     def tearDown(self):
         """Clean up after each test"""
         if hasattr(self, 'driver'):
+            impact_map.stop_recording(self)
             self.driver.quit()
     
     def generate_random_email(self):
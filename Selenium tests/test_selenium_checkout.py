@@ -10,6 +10,7 @@ from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.common.action_chains import ActionChains
 import random
 import string
+import impact_map
 
 class TestCheckoutProcess(unittest.TestCase):
     
@@ -31,9 +32,13 @@ class TestCheckoutProcess(unittest.TestCase):
         # Base URL - update this to match your application URL
         self.base_url = "http://localhost:5173"  # Default Vite dev server port
         
+        # Start JS coverage and route-hit recording (no-op unless IMPACT_RECORD=1)
+        impact_map.start_recording(self)
+        
     def tearDown(self):
         """Clean up after each test"""
         if hasattr(self, 'driver'):
+            impact_map.stop_recording(self)
             self.driver.quit()
     
     def login_user(self):
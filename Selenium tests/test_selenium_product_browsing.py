@@ -8,6 +8,7 @@ from selenium.webdriver.common.keys import Keys
 from selenium.webdriver.chrome.service import Service
 from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.common.action_chains import ActionChains
+import impact_map
 
 class TestProductBrowsingAndCart(unittest.TestCase):
     
@@ -29,9 +30,13 @@ class TestProductBrowsingAndCart(unittest.TestCase):
         # Base URL - update this to match your application URL
         self.base_url = "http://localhost:5173"  # Default Vite dev server port
         
+        # Start JS coverage and route-hit recording (no-op unless IMPACT_RECORD=1)
+        impact_map.start_recording(self)
+        
     def tearDown(self):
         """Clean up after each test"""
         if hasattr(self, 'driver'):
+            impact_map.stop_recording(self)
             self.driver.quit()
     
     def test_product_browsing_and_filtering(self):
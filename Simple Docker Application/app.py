@@ -1,32 +1,161 @@
-from flask import Flask, render_template, request, redirect, url_for
+import json
+import threading
+import uuid
+from collections import deque
+
+from flask import Flask, Response, render_template, request, redirect, url_for, jsonify, abort
 
 app = Flask(__name__)
 
-# In-memory storage for books
-books = []
+
+class BookStore:
+    """In-memory book storage that publishes a versioned change feed.
+
+    Every mutation bumps ``version`` and appends one delta event to a bounded
+    log, so subscribers can catch up from the last version they saw. Versions
+    are only meaningful within one ``epoch``, which changes on every restart.
+    """
+
+    def __init__(self, history=1000):
+        self._books = {}
+        self._next_id = 1
+        self._log = deque(maxlen=history)
+        self._changed = threading.Condition()
+        self.epoch = uuid.uuid4().hex
+        self.version = 0
+
+    def snapshot(self):
+        with self._changed:
+            return self.version, [dict(book) for book in self._books.values()]
+
+    def add(self, title, author):
+        with self._changed:
+            book = {"id": self._next_id, "title": title, "author": author, "read": False}
+            self._next_id += 1
+            self._books[book["id"]] = book
+            return self._publish("add", dict(book))
+
+    def toggle_read(self, book_id):
+        with self._changed:
+            book = self._books.get(book_id)
+            if book is None:
+                return None
+            book["read"] = not book["read"]
+            return self._publish("update", dict(book))
+
+    def delete(self, book_id):
+        with self._changed:
+            if self._books.pop(book_id, None) is None:
+                return None
+            return self._publish("delete", {"id": book_id})
+
+    def events_since(self, version, timeout=None):
+        """Return the events newer than ``version``, waiting up to ``timeout``.
+
+        Returns an empty list on timeout and ``None`` when ``version`` can no
+        longer be replayed from the log; the caller must then resync from a
+        snapshot. Versions from another epoch are the caller's to reject.
+        """
+        with self._changed:
+            self._changed.wait_for(lambda: self.version != version, timeout)
+            if version == self.version:
+                return []
+            oldest = self._log[0]["version"] if self._log else self.version + 1
+            if version > self.version or version < oldest - 1:
+                return None
+            return [event for event in self._log if event["version"] > version]
+
+    def _publish(self, op, book):
+        self.version += 1
+        event = {"version": self.version, "op": op, "book": book}
+        self._log.append(event)
+        self._changed.notify_all()
+        return event
+
+
+store = BookStore()
+
+
+def event_id(version):
+    return f"{store.epoch}:{version}"
+
+
+def parse_event_id(value):
+    """Version from an ``epoch:version`` id, or -1 if it is from another epoch."""
+    epoch, _, version = (value or "").rpartition(":")
+    if epoch != store.epoch or not version.isdigit():
+        return -1
+    return int(version)
+
+
+def format_event(name, version, data):
+    return f"id: {event_id(version)}\nevent: {name}\ndata: {json.dumps(data, separators=(',', ':'))}\n\n"
+
+
+def wants_json():
+    return request.accept_mimetypes.best_match(["text/html", "application/json"]) == "application/json"
+
+
+def mutation_response(event):
+    if wants_json():
+        if event is None:
+            abort(404)
+        return jsonify(event)
+    return redirect(url_for("index"))
+
 
 @app.route("/", methods=["GET", "POST"])
 def index():
     if request.method == "POST":
-        title = request.form.get("title").strip()
-        author = request.form.get("author").strip()
+        title = request.form.get("title", "").strip()
+        author = request.form.get("author", "").strip()
         if title and author:
-            books.append({"title": title, "author": author, "read": False})
+            return mutation_response(store.add(title, author))
+        if wants_json():
+            abort(400)
         return redirect(url_for("index"))
 
-    return render_template("index.html", books=books)
+    version, books = store.snapshot()
+    return render_template("index.html", books=books, version=version, since=event_id(version))
+
 
-@app.route("/toggle_read/<int:book_id>")
+@app.route("/toggle_read/<int:book_id>", methods=["GET", "POST"])
 def toggle_read(book_id):
-    if 0 <= book_id < len(books):
-        books[book_id]["read"] = not books[book_id]["read"]
-    return redirect(url_for("index"))
+    return mutation_response(store.toggle_read(book_id))
+
 
-@app.route("/delete/<int:book_id>")
+@app.route("/delete/<int:book_id>", methods=["GET", "POST"])
 def delete(book_id):
-    if 0 <= book_id < len(books):
-        books.pop(book_id)
-    return redirect(url_for("index"))
+    return mutation_response(store.delete(book_id))
+
+
+@app.route("/events")
+def events():
+    # EventSource resends the last seen id on reconnect; the query string
+    # carries the id the page was rendered at for the first connect. Ids from
+    # before a restart fail to parse and force a reset.
+    since = parse_event_id(request.headers.get("Last-Event-ID") or request.args.get("since"))
+
+    def stream():
+        last = since
+        yield "retry: 2000\n\n"
+        while True:
+            pending = store.events_since(last, timeout=15)
+            if pending is None:
+                last, books = store.snapshot()
+                yield format_event("reset", last, {"version": last, "books": books})
+            elif not pending:
+                yield ": keep-alive\n\n"
+            for event in pending or ():
+                last = event["version"]
+                yield format_event("book", last, event)
+
+    return Response(
+        stream(),
+        mimetype="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
 
 if __name__ == "__main__":
-    app.run(host="0.0.0.0", port=5000, debug=True)
+    app.run(host="0.0.0.0", port=5000, debug=True, threaded=True)
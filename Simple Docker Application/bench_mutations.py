@@ -0,0 +1,66 @@
+"""Compare the cost of one "Mark Read" click under both update paths.
+
+redirect: GET /toggle_read/<id> -> 302 -> full render of the list (old page).
+feed:     POST /toggle_read/<id> -> JSON delta, plus the SSE frame pushed to
+          each subscribed tab.
+
+Bytes are response bodies and headers as sent. CPU is process time for the
+whole request cycle, so it includes the Werkzeug test client's own overhead
+on both paths. Run with: python bench_mutations.py
+"""
+import time
+
+from app import BookStore, app, format_event
+import app as app_module
+
+SIZES = (10, 100, 1000)
+MUTATIONS = 200
+
+
+def response_bytes(response):
+    headers = sum(len(f"{name}: {value}\r\n") for name, value in response.headers)
+    return headers + len(response.get_data())
+
+
+def seed(size):
+    app_module.store = BookStore()
+    for i in range(size):
+        app_module.store.add(f"Book {i}", f"Author {i}")
+
+
+def bench_redirect(client, size):
+    seed(size)
+    sent = 0
+    start = time.process_time()
+    for i in range(MUTATIONS):
+        redirect = client.get(f"/toggle_read/{i % size + 1}")
+        page = client.get(redirect.headers["Location"])
+        sent += response_bytes(redirect) + response_bytes(page)
+    return sent / MUTATIONS, (time.process_time() - start) / MUTATIONS
+
+
+def bench_feed(client, size):
+    seed(size)
+    sent = 0
+    start = time.process_time()
+    for i in range(MUTATIONS):
+        reply = client.post(f"/toggle_read/{i % size + 1}", headers={"Accept": "application/json"})
+        event = reply.get_json()
+        pending = app_module.store.events_since(event["version"] - 1, timeout=0)
+        assert pending == [event], pending
+        frame = format_event("book", event["version"], event)
+        sent += response_bytes(reply) + len(frame.encode())
+    return sent / MUTATIONS, (time.process_time() - start) / MUTATIONS
+
+
+def main():
+    client = app.test_client()
+    print(f"{'books':>6} {'path':>9} {'bytes/mutation':>15} {'cpu us/mutation':>16}")
+    for size in SIZES:
+        for name, bench in (("redirect", bench_redirect), ("feed", bench_feed)):
+            sent, cpu = bench(client, size)
+            print(f"{size:>6} {name:>9} {sent:>15.0f} {cpu * 1e6:>16.0f}")
+
+
+if __name__ == "__main__":
+    main()
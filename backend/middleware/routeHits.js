@@ -0,0 +1,27 @@
+// Records which route files have served requests so the Selenium impact map
+// can link each browser test to the backend routes it exercises.
+// Only mounted when RECORD_ROUTE_HITS=true.
+const hits = new Set();
+
+export const recordRouteHits = (routeFiles) => (req, res, next) => {
+  const file = routeFiles[req.path.split('/')[1]];
+  if (file) {
+    hits.add(file);
+  }
+  next();
+};
+
+// GET returns the files hit so far, DELETE resets them between tests
+export const routeHits = (req, res) => {
+  const files = [...hits].sort();
+  if (req.method === 'DELETE') {
+    hits.clear();
+  }
+
+  res.status(200).json({
+    status: 'success',
+    data: {
+      files
+    }
+  });
+};
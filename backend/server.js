@@ -11,6 +11,7 @@ import productRoutes from './routes/products.js';
 import orderRoutes from './routes/orders.js';
 import cartRoutes from './routes/cart.js';
 import { errorHandler } from './middleware/errorHandler.js';
+import { recordRouteHits, routeHits } from './middleware/routeHits.js';
 
 // Load environment variables
 dotenv.config({ path: './config.env' });
@@ -30,6 +31,18 @@ app.use(cors({
   credentials: true
 }));
 
+// Route-hit recording for the Selenium impact map (test runs only)
+if (process.env.RECORD_ROUTE_HITS === 'true') {
+  app.use('/api/__impact/route-hits', routeHits);
+  app.use('/api', recordRouteHits({
+    auth: 'backend/routes/auth.js',
+    users: 'backend/routes/users.js',
+    products: 'backend/routes/products.js',
+    orders: 'backend/routes/orders.js',
+    cart: 'backend/routes/cart.js'
+  }));
+}
+
 // Rate limiting
 const limiter = rateLimit({
   windowMs: parseInt(process.env.RATE_LIMIT_WINDOW_MS) || 15 * 60 * 1000,